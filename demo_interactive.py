@@ -6,7 +6,8 @@ This script demonstrates how the interactive date selection works
 without actually connecting to Google Calendar or sending emails.
 """
 
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
 import calendar
 
 def parse_custom_date_range(date_input):
@@ -17,7 +18,7 @@ def parse_custom_date_range(date_input):
     date_input = date_input.lower().strip()
     
     # Pacific Time timezone for calculations
-    pacific_tz = timezone(timedelta(hours=-7))  # PDT
+    pacific_tz = ZoneInfo('America/Los_Angeles')
     
     # Handle "to" format: "2024-08-01 to 2024-08-04"
     if " to " in date_input:
@@ -1,10 +1,16 @@
 import os
-import smtplib
+import io
+import asyncio
 import json
 from email.message import EmailMessage
-from datetime import datetime
+from typing import Iterator
+from datetime import date, datetime
 from dotenv import load_dotenv
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+import html
 import re
+from collections import defaultdict
+import aiosmtplib
 
 # Load environment variables
 load_dotenv()
@@ -16,23 +22,80 @@ EMAIL_USER = os.getenv('EMAIL_USER', '')
 EMAIL_PASSWORD = os.getenv('EMAIL_PASSWORD', '')
 RECIPIENT_EMAIL = os.getenv('RECIPIENT_EMAIL', '')
 
-def format_calendar_data_for_email(calendar_data):
+# HTML email template, compiled once at import (autoescape handles event titles and URLs).
+# The compiled render function is cached on disk so later runs skip template compilation.
+TEMPLATE_ENV = Environment(
+    loader=FileSystemLoader(os.path.dirname(os.path.abspath(__file__))),
+    bytecode_cache=FileSystemBytecodeCache(),
+    autoescape=True,
+    trim_blocks=True,
+    lstrip_blocks=True
+)
+CALENDAR_TEMPLATE = TEMPLATE_ENV.get_template('calendar.html.j2')
+
+# Month and weekday names for the strftime replacements below (the C locale names strftime uses)
+_MONTHS = ('January', 'February', 'March', 'April', 'May', 'June',
+           'July', 'August', 'September', 'October', 'November', 'December')
+_MONTH_ABBRS = tuple(month[:3] for month in _MONTHS)
+_DAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+# Compiled once at import instead of on every event or URL
+# Age group tags like [Ages X-X] or (Ages X-X), with any whitespace before them
+_AGE_GROUP_RE = re.compile(r'\s*(?:\[Ages?\s*(\d+-\d+)\]|\(Ages?\s*(\d+-\d+)\))')
+_TAG_RE = re.compile(r'<[^>]+>')
+_TRAILING_TAG_TEXT_RE = re.compile(r'">[^"]*$')
+
+def _fmt_full_date(dt: date) -> str:
+    """Equivalent of dt.strftime('%A, %B %d, %Y')."""
+    return f"{_DAYS[dt.weekday()]}, {_MONTHS[dt.month - 1]} {dt.day:02d}, {dt.year}"
+
+def _fmt_weekday_date(dt: date) -> str:
+    """Equivalent of dt.strftime('%A, %B %d')."""
+    return f"{_DAYS[dt.weekday()]}, {_MONTHS[dt.month - 1]} {dt.day:02d}"
+
+def _fmt_month_day(dt: date) -> str:
+    """Equivalent of dt.strftime('%B %d')."""
+    return f"{_MONTHS[dt.month - 1]} {dt.day:02d}"
+
+def _fmt_month_day_year(dt: date) -> str:
+    """Equivalent of dt.strftime('%B %d, %Y')."""
+    return f"{_MONTHS[dt.month - 1]} {dt.day:02d}, {dt.year}"
+
+def _fmt_short_month_day(dt: date) -> str:
+    """Equivalent of dt.strftime('%b %d')."""
+    return f"{_MONTH_ABBRS[dt.month - 1]} {dt.day:02d}"
+
+def _fmt_time(dt: datetime) -> str:
+    """Equivalent of dt.strftime('%I:%M%p')."""
+    return f"{dt.hour % 12 or 12:02d}:{dt.minute:02d}{'AM' if dt.hour < 12 else 'PM'}"
+
+def format_calendar_data_for_email(calendar_data: dict) -> str:
     """
     Format the calendar data into a clean, professional email format showing one-time events and ongoing events summary.
     
     :param calendar_data: Dictionary containing categorized events
     :return: HTML formatted string for email
     """
+    return "".join(iter_html_chunks(calendar_data))
+
+def iter_html_chunks(calendar_data: dict) -> Iterator[str]:
+    """
+    Generate the HTML email for the calendar data chunk by chunk, as the template emits it.
+    
+    :param calendar_data: Dictionary containing categorized events
+    :return: Iterator of HTML string chunks
+    """
     if not calendar_data:
-        return "<p>No calendar events found for the specified time period.</p>"
+        yield "<p>No calendar events found for the specified time period.</p>"
+        return
     
     # Get one-time events
     all_one_time_events = []
     all_ongoing_events = []
     
-    for date in calendar_data:
-        all_one_time_events.extend(calendar_data[date]['one_time_events'])
-        all_ongoing_events.extend(calendar_data[date]['ongoing_events'])
+    for day in calendar_data.values():
+        all_one_time_events.extend(day['one_time_events'])
+        all_ongoing_events.extend(day['ongoing_events'])
     
     # Count total events for summary
     total_one_time = len(all_one_time_events)
@@ -41,541 +104,252 @@ def format_calendar_data_for_email(calendar_data):
     
     # Get date range
     sorted_dates = sorted(calendar_data.keys())
-    start_date = datetime.strptime(sorted_dates[0], '%Y-%m-%d')
-    end_date = datetime.strptime(sorted_dates[-1], '%Y-%m-%d')
+    start_date = date.fromisoformat(sorted_dates[0])
+    end_date = date.fromisoformat(sorted_dates[-1])
     
     # Format date range
     if start_date == end_date:
-        date_range = start_date.strftime('%A, %B %d, %Y')
+        date_range = _fmt_full_date(start_date)
     else:
-        date_range = f"{start_date.strftime('%B %d')} - {end_date.strftime('%B %d, %Y')}"
-    
-    html_content = f'''
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta http-equiv="Content-Type" content="text/html; charset=UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Calendar Summary</title>
-    </head>
-    <body style="font-family: Arial, sans-serif; font-size: 16px; margin: 0; padding: 20px; background-color: #f5f5f5;">
-        <div style="max-width: 800px; margin: 0 auto; background-color: white; border-radius: 8px; box-shadow: 0 2px 10px rgba(0,0,0,0.1); overflow: hidden;">
-            <!-- Professional Header -->
-            <div style="background-color: #2c3e50; color: white; text-align: center; padding: 30px;">
-                <h1 style="margin: 0; font-size: 32px; font-weight: 600;">📅 Calendar Summary</h1>
-                <p style="margin: 10px 0 0 0; font-size: 16px; opacity: 0.9;">Here's your calendar summary for {date_range}</p>
-            </div>
-            
-            <div style="padding: 30px;">
-                <!-- Summary Section -->
-                <div style="background-color: #ecf0f1; border-left: 4px solid #3498db; padding: 20px; margin-bottom: 30px; border-radius: 4px;">
-                    <h3 style="margin: 0 0 10px 0; color: #2c3e50; font-size: 18px;">📊 Summary</h3>
-                    <p style="margin: 0; color: #34495e; font-size: 16px;"><strong>{total_events} total events</strong> across {len(calendar_data)} days</p>
-                    <p style="margin: 5px 0 0 0; color: #7f8c8d; font-size: 14px;">• {total_one_time} upcoming one-time events</p>
-                    <p style="margin: 5px 0 0 0; color: #7f8c8d; font-size: 14px;">• {total_ongoing} ongoing events</p>
-                </div>
-    '''
+        date_range = f"{_fmt_month_day(start_date)} - {_fmt_month_day_year(end_date)}"
+    
+    yield from CALENDAR_TEMPLATE.generate(
+        date_range=date_range,
+        total_events=total_events,
+        total_days=len(calendar_data),
+        total_one_time=total_one_time,
+        total_ongoing=total_ongoing,
+        one_time_sections=group_one_time_events(all_one_time_events, calendar_data),
+        ongoing_sections=summarize_ongoing_events(all_ongoing_events),
+    )
+
+def group_one_time_events(one_time_events: list[dict], calendar_data: dict) -> list[dict]:
+    """
+    Group one-time events by date for the email template.
     
-    # Add one-time events if they exist
-    if all_one_time_events:
-        html_content += '''
-                <!-- One-time Events Section -->
-                <div style="margin-bottom: 30px;">
-                    <h2 style="margin: 0 0 20px 0; color: #2c3e50; font-size: 22px; font-weight: 600; border-bottom: 2px solid #3498db; padding-bottom: 10px;">📅 Upcoming One-time Events</h2>
-        '''
-        
-        # Group one-time events by date
-        events_by_date = {}
-        for event in all_one_time_events:
-            date = format_date(event['start'])
-            if date not in events_by_date:
-                events_by_date[date] = []
-            events_by_date[date].append(event)
-        
-        # Sort dates
-        sorted_dates = sorted(events_by_date.keys(), key=lambda x: datetime.strptime(x, '%B %d'))
-        
-        for i, date in enumerate(sorted_dates):
-            events = events_by_date[date]
-            
-            # Get full date for header
-            try:
-                # Find the original date from calendar_data
-                for original_date in sorted(calendar_data.keys()):
-                    date_obj = datetime.strptime(original_date, '%Y-%m-%d')
-                    if date_obj.strftime('%B %d') == date:
-                        full_date = date_obj.strftime('%A, %B %d')
-                        break
-                else:
-                    full_date = date
-            except:
-                full_date = date
-            
-            html_content += f'''
-                    <!-- Date Section -->
-                    <div style="margin-bottom: 25px; border: 1px solid #e0e0e0; border-radius: 6px; overflow: hidden;">
-                        <div style="background-color: #34495e; color: white; padding: 15px 20px;">
-                            <h3 style="margin: 0; font-size: 18px; font-weight: 600;">{full_date}</h3>
-                        </div>
-                        <div style="padding: 20px; background-color: white;">
-            '''
-            
-            for event in events:
-                title = event["summary"]
-                location = event.get('location', '')
-                start_time = format_time(event['start'])
-                end_time = format_end_time(event.get('end', ''))
-                
-                # Get emoji based on event title
-                emoji = get_event_emoji(title)
-                
-                # Create event text
-                event_text = f"{emoji} {title}"
-                if location:
-                    event_text += f" – {location}"
-                
-                # Add time information
-                if end_time and end_time != start_time:
-                    event_text += f" ({start_time} - {end_time})"
-                else:
-                    event_text += f" ({start_time})"
-                
-                # Add booking link separately if available
-                if event.get('booking_links'):
-                    cleaned_links = [clean_booking_url(link) for link in event['booking_links'] if clean_booking_url(link)]
-                    if cleaned_links:
-                        booking_link = cleaned_links[0]
-                        event_text += f'<br><a href="{booking_link}" target="_blank" style="display: inline-block; background-color: #3498db; color: white; text-decoration: none; font-size: 12px; padding: 6px 12px; border-radius: 4px; margin-top: 8px; font-weight: 500;">🔗 Book Here</a>'
-                        if len(cleaned_links) > 1:
-                            event_text += f'<br><a href="{cleaned_links[1]}" target="_blank" style="display: inline-block; background-color: #27ae60; color: white; text-decoration: none; font-size: 12px; padding: 6px 12px; border-radius: 4px; margin-top: 5px; font-weight: 500;">🔗 Additional Booking</a>'
-                
-                html_content += f'''
-                            <div style="margin-bottom: 12px; padding: 12px; background-color: #f8f9fa; border-left: 3px solid #3498db; border-radius: 3px;">
-                                <div style="font-size: 15px; line-height: 1.4; color: #2c3e50;">• {event_text}</div>
-                            </div>
-                '''
-            
-            html_content += '''
-                        </div>
-                    </div>
-            '''
-        
-        html_content += '''
-                </div>
-        '''
+    :param one_time_events: List of one-time event dictionaries
+    :param calendar_data: Dictionary containing categorized events
+    :return: List of date sections, each with a 'full_date' header and its 'events'
+    """
+    # Group one-time events by date
+    events_by_date: defaultdict[date, list[dict]] = defaultdict(list)
+    for event in one_time_events:
+        events_by_date[event_date(event['start'])].append(event)
+    
+    # Dates in calendar_data get a full header with the weekday
+    calendar_dates = set()
+    for original_date in calendar_data:
+        try:
+            calendar_dates.add(date.fromisoformat(original_date))
+        except ValueError:
+            continue
+    
+    sections = []
+    for start_date in sorted(events_by_date):
+        sections.append({
+            'full_date': _fmt_weekday_date(start_date) if start_date in calendar_dates else _fmt_month_day(start_date),
+            'events': [format_one_time_event(event) for event in events_by_date[start_date]]
+        })
+    
+    return sections
+
+def format_one_time_event(event: dict) -> dict:
+    """
+    Prepare a one-time event for display in the email template.
     
-    # Add ongoing events summary if they exist
-    if all_ongoing_events:
-        html_content += '''
-                <!-- Ongoing Events Summary Section -->
-                <div style="margin-bottom: 30px;">
-                    <h2 style="margin: 0 0 20px 0; color: #2c3e50; font-size: 22px; font-weight: 600; border-bottom: 2px solid #e67e22; padding-bottom: 10px;">📅 Ongoing Camps & Weekly Classes</h2>
-                    <div style="background-color: #fef9e7; border: 1px solid #f39c12; border-radius: 6px; padding: 20px;">
-        '''
-        
-        # Group ongoing events by category
-        events_by_category = {
-            'Summer Camps': [],
-            'Weekly Programs': [],
-            'Other Activities': []
-        }
-        
-        for event in all_ongoing_events:
+    :param event: Event dictionary
+    :return: Dictionary with emoji, title, location, time and up to two booking links
+    """
+    title = event["summary"]
+    start_time = format_time(event['start'])
+    end_time = format_end_time(event.get('end', ''))
+    
+    # Add time information
+    if end_time and end_time != start_time:
+        time_text = f"{start_time} - {end_time}"
+    else:
+        time_text = start_time
+    
+    # Add booking links separately if available
+    booking_links = []
+    if event.get('booking_links'):
+        booking_links = [clean_booking_url(link) for link in event['booking_links'] if clean_booking_url(link)][:2]
+    
+    return {
+        'emoji': get_event_emoji(title), # Get emoji based on event title
+        'title': title,
+        'location': event.get('location', ''),
+        'time': time_text,
+        'booking_links': booking_links
+    }
+
+def summarize_ongoing_events(ongoing_events: list[dict]) -> list[dict]:
+    """
+    Group ongoing events into categories and summarize each category for the email template.
+    
+    :param ongoing_events: List of ongoing event dictionaries
+    :return: List of category sections, each with a 'heading' and summary 'lines'
+    """
+    # Group ongoing events by category
+    events_by_category: dict[str, list[dict]] = {
+        'Summer Camps': [],
+        'Weekly Programs': [],
+        'Other Activities': []
+    }
+    
+    # The same event dict is listed under every day it spans, so categorize each one only once
+    category_by_event: dict[int, str] = {}
+    for event in ongoing_events:
+        category = category_by_event.get(id(event))
+        if category is None:
             title = event["summary"].lower()
             
             # Categorize events based on title keywords - check Summer Camps first
             if any(word in title for word in ['camp', 'summer', 'immersion', '2025']):
-                events_by_category['Summer Camps'].append(event)
+                category = 'Summer Camps'
             elif any(word in title for word in ['weekly', 'club', 'program', 'class', 'basketball', 'volleyball', 'tennis', 'soccer', 'baseball', 'track']):
-                events_by_category['Weekly Programs'].append(event)
+                category = 'Weekly Programs'
             else:
-                events_by_category['Other Activities'].append(event)
-        
-        # Display Summer Camps section
-        if events_by_category['Summer Camps']:
-            html_content += '''
-                        <div style="margin-bottom: 20px;">
-                            <h3 style="margin: 0 0 15px 0; color: #2c3e50; font-size: 18px; font-weight: 600;">😊 Summer Camps</h3>
-            '''
-            
-            # Group by base title to consolidate similar events (e.g., basketball club by age groups)
-            camps_by_base_title = {}
-            for event in events_by_category['Summer Camps']:
-                title = event["summary"]
-                
-                # Extract base title by removing age group brackets and extra details
-                base_title = title
-                # Remove age group patterns like [Ages X-X] or (Ages X-X)
-                base_title = re.sub(r'\s*\[Ages?\s*\d+-\d+\]', '', base_title)
-                base_title = re.sub(r'\s*\(Ages?\s*\d+-\d+\)', '', base_title)
-                # Remove extra whitespace
-                base_title = base_title.strip()
-                
-                # Extract age group if present
-                age_match = re.search(r'\[Ages?\s*(\d+-\d+)\]|\(Ages?\s*(\d+-\d+)\)', title)
-                age_group = age_match.group(1) or age_match.group(2) if age_match else None
-                
-                # Create unique key that includes age group to keep them separate
-                if age_group:
-                    unique_key = f"{base_title} [Ages {age_group}]"
-                else:
-                    unique_key = base_title
-                
-                if unique_key not in camps_by_base_title:
-                    camps_by_base_title[unique_key] = {
-                        'events': [],
-                        'dates': set(),
-                        'locations': set(),
-                        'times': set(),
-                        'base_title': base_title,
-                        'age_group': age_group
-                    }
-                
-                date = format_date(event['start'])
-                time = format_time(event['start'])
-                end_time = format_end_time(event.get('end', ''))
-                camps_by_base_title[unique_key]['events'].append(event)
-                camps_by_base_title[unique_key]['dates'].add(date)
-                camps_by_base_title[unique_key]['times'].add(time)
-                if event.get('end'):
-                    camps_by_base_title[unique_key]['end_times'] = camps_by_base_title[unique_key].get('end_times', set())
-                    camps_by_base_title[unique_key]['end_times'].add(end_time)
-                if event.get('location'):
-                    camps_by_base_title[unique_key]['locations'].add(event['location'])
-            
-            for unique_key, info in camps_by_base_title.items():
-                events = info['events']
-                dates = sorted(info['dates'], key=lambda x: datetime.strptime(x, '%B %d'))
-                times = sorted(info['times'])
-                end_times = sorted(info.get('end_times', set()))
-                locations = list(info['locations'])
-                base_title = info['base_title']
-                age_group = info['age_group']
-                
-                # Create event text
-                event_text = base_title
-                
-                # Add age group if present
-                if age_group:
-                    event_text += f" [Ages {age_group}]"
-                
-                if locations:
-                    event_text += f" – {', '.join(locations)}"
-                
-                # Enhanced logic to determine if it's a daily/recurring event
-                title_lower = base_title.lower()
-                is_recurring_by_keywords = any(word in title_lower for word in ['camp', 'daily', 'weekly', 'ongoing', 'recurring', 'class', 'program', 'club'])
-                
-                # Check if events span multiple days or appear frequently
-                date_objects = [datetime.strptime(date, '%B %d') for date in dates]
-                date_range_days = (max(date_objects) - min(date_objects)).days + 1
-                events_per_day = len(events) / len(dates) if dates else 0
-                
-                # Consider it daily if:
-                # 1. Has recurring keywords, OR
-                # 2. Spans multiple days, OR  
-                # 3. Has multiple events per day (like different age groups)
-                is_daily = (is_recurring_by_keywords or 
-                           len(dates) > 1 or 
-                           events_per_day > 1 or
-                           'summer' in title_lower)
-                
-                if is_daily:
-                    # Daily event - show as daily with all times
-                    if end_times and len(end_times) == len(times):
-                        # Show start-end time pairs
-                        time_pairs = []
-                        for i, start_time in enumerate(times):
-                            if i < len(end_times):
-                                time_pairs.append(f"{start_time}-{end_times[i]}")
-                            else:
-                                time_pairs.append(start_time)
-                        event_text += f" (daily, {', '.join(time_pairs)})"
-                    else:
-                        # Just show start times
-                        event_text += f" (daily, {', '.join(times)})"
-                else:
-                    # Single day event - show date and time
-                    if end_times and len(end_times) == len(times):
-                        # Show start-end time pairs
-                        time_pairs = []
-                        for i, start_time in enumerate(times):
-                            if i < len(end_times):
-                                time_pairs.append(f"{start_time}-{end_times[i]}")
-                            else:
-                                time_pairs.append(start_time)
-                        event_text += f" ({dates[0]}, {', '.join(time_pairs)})"
-                    else:
-                        # Just show start times
-                        event_text += f" ({dates[0]}, {', '.join(times)})"
-                
-                html_content += f'''
-                            <div style="margin-bottom: 8px; font-size: 15px; line-height: 1.4; color: #2c3e50;">• {event_text}</div>
-                '''
-            
-            html_content += '''
-                        </div>
-            '''
-        
-        # Display Weekly Programs section
-        if events_by_category['Weekly Programs']:
-            html_content += '''
-                        <div style="margin-bottom: 20px;">
-                            <h3 style="margin: 0 0 15px 0; color: #2c3e50; font-size: 18px; font-weight: 600;">🏀 Weekly Rec Center Programs</h3>
-            '''
-            
-            # Group by base title to consolidate similar events
-            programs_by_base_title = {}
-            for event in events_by_category['Weekly Programs']:
-                title = event["summary"]
-                
-                # Extract base title by removing age group brackets and extra details
-                base_title = title
-                # Remove age group patterns like [Ages X-X] or (Ages X-X)
-                base_title = re.sub(r'\s*\[Ages?\s*\d+-\d+\]', '', base_title)
-                base_title = re.sub(r'\s*\(Ages?\s*\d+-\d+\)', '', base_title)
-                # Remove extra whitespace
-                base_title = base_title.strip()
-                
-                # Extract age group if present
-                age_match = re.search(r'\[Ages?\s*(\d+-\d+)\]|\(Ages?\s*(\d+-\d+)\)', title)
-                age_group = age_match.group(1) or age_match.group(2) if age_match else None
-                
-                # Create unique key that includes age group to keep them separate
-                if age_group:
-                    unique_key = f"{base_title} [Ages {age_group}]"
-                else:
-                    unique_key = base_title
-                
-                if unique_key not in programs_by_base_title:
-                    programs_by_base_title[unique_key] = {
-                        'events': [],
-                        'dates': set(),
-                        'locations': set(),
-                        'times': set(),
-                        'base_title': base_title,
-                        'age_group': age_group
-                    }
-                
-                date = format_date(event['start'])
-                time = format_time(event['start'])
-                end_time = format_end_time(event.get('end', ''))
-                programs_by_base_title[unique_key]['events'].append(event)
-                programs_by_base_title[unique_key]['dates'].add(date)
-                programs_by_base_title[unique_key]['times'].add(time)
-                if event.get('end'):
-                    programs_by_base_title[unique_key]['end_times'] = programs_by_base_title[unique_key].get('end_times', set())
-                    programs_by_base_title[unique_key]['end_times'].add(end_time)
-                if event.get('location'):
-                    programs_by_base_title[unique_key]['locations'].add(event['location'])
-            
-            for unique_key, info in programs_by_base_title.items():
-                events = info['events']
-                dates = sorted(info['dates'], key=lambda x: datetime.strptime(x, '%B %d'))
-                times = sorted(info['times'])
-                end_times = sorted(info.get('end_times', set()))
-                locations = list(info['locations'])
-                base_title = info['base_title']
-                age_group = info['age_group']
-                
-                # Create event text
-                event_text = base_title
-                
-                # Add age group if present
-                if age_group:
-                    event_text += f" [Ages {age_group}]"
-                
-                if locations:
-                    event_text += f" – {', '.join(locations)}"
-                
-                # Enhanced logic to determine if it's a daily/recurring event
-                title_lower = base_title.lower()
-                is_recurring_by_keywords = any(word in title_lower for word in ['camp', 'daily', 'weekly', 'ongoing', 'recurring', 'class', 'program', 'club'])
-                
-                # Check if events span multiple days or appear frequently
-                date_objects = [datetime.strptime(date, '%B %d') for date in dates]
-                date_range_days = (max(date_objects) - min(date_objects)).days + 1
-                events_per_day = len(events) / len(dates) if dates else 0
-                
-                # Consider it daily if:
-                # 1. Has recurring keywords, OR
-                # 2. Spans multiple days, OR  
-                # 3. Has multiple events per day (like different age groups)
-                is_daily = (is_recurring_by_keywords or 
-                           len(dates) > 1 or 
-                           events_per_day > 1)
-                
-                if is_daily:
-                    # Daily event - show as daily with all times
-                    if end_times and len(end_times) == len(times):
-                        # Show start-end time pairs
-                        time_pairs = []
-                        for i, start_time in enumerate(times):
-                            if i < len(end_times):
-                                time_pairs.append(f"{start_time}-{end_times[i]}")
-                            else:
-                                time_pairs.append(start_time)
-                        event_text += f" (daily, {', '.join(time_pairs)})"
-                    else:
-                        # Just show start times
-                        event_text += f" (daily, {', '.join(times)})"
-                else:
-                    # Single day event - show date and time
-                    event_text += f" ({dates[0]}, {', '.join(times)})"
-                
-                html_content += f'''
-                            <div style="margin-bottom: 8px; font-size: 15px; line-height: 1.4; color: #2c3e50;">• {event_text}</div>
-                '''
+                category = 'Other Activities'
+            category_by_event[id(event)] = category
+        events_by_category[category].append(event)
+    
+    recurring_keywords = ['camp', 'daily', 'weekly', 'ongoing', 'recurring', 'class', 'program', 'club']
+    
+    sections = []
+    if events_by_category['Summer Camps']:
+        sections.append({
+            'heading': '😊 Summer Camps',
+            'lines': summarize_ongoing_category(events_by_category['Summer Camps'], recurring_keywords + ['summer'])
+        })
+    if events_by_category['Weekly Programs']:
+        sections.append({
+            'heading': '🏀 Weekly Rec Center Programs',
+            'lines': summarize_ongoing_category(events_by_category['Weekly Programs'], recurring_keywords,
+                                                show_single_day_end_times=False)
+        })
+    if events_by_category['Other Activities']:
+        sections.append({
+            'heading': '⛵ Other Activities',
+            'lines': summarize_ongoing_category(events_by_category['Other Activities'], recurring_keywords + ['ride', 'bus'])
+        })
+    
+    return sections
+
+def summarize_ongoing_category(events: list[dict], recurring_keywords: list[str],
+                               show_single_day_end_times: bool = True) -> list[str]:
+    """
+    Consolidate the ongoing events of one category into one summary line per base title.
+    
+    :param events: List of ongoing event dictionaries in the category
+    :param recurring_keywords: Title keywords that mark an event as daily/recurring
+    :param show_single_day_end_times: Whether single-day entries show start-end time pairs
+    :return: List of summary lines
+    """
+    # Group by base title to consolidate similar events (e.g., basketball club by age groups)
+    events_by_base_title: dict[str, dict] = {}
+    # Ongoing events are shared by reference across the days they span; derive each one's fields once
+    derived_by_event: dict[int, tuple] = {}
+    for event in events:
+        derived = derived_by_event.get(id(event))
+        if derived is None:
+            title = event["summary"]
             
-            html_content += '''
-                        </div>
-            '''
-        
-        # Display Other Activities section
-        if events_by_category['Other Activities']:
-            html_content += '''
-                        <div style="margin-bottom: 20px;">
-                            <h3 style="margin: 0 0 15px 0; color: #2c3e50; font-size: 18px; font-weight: 600;">⛵ Other Activities</h3>
-            '''
+            # Extract base title by removing age group patterns like [Ages X-X] or (Ages X-X)
+            base_title = _AGE_GROUP_RE.sub('', title).strip()
             
-            # Group by base title to consolidate similar events
-            activities_by_base_title = {}
-            for event in events_by_category['Other Activities']:
-                title = event["summary"]
-                
-                # Extract base title by removing age group brackets and extra details
-                base_title = title
-                # Remove age group patterns like [Ages X-X] or (Ages X-X)
-                base_title = re.sub(r'\s*\[Ages?\s*\d+-\d+\]', '', base_title)
-                base_title = re.sub(r'\s*\(Ages?\s*\d+-\d+\)', '', base_title)
-                # Remove extra whitespace
-                base_title = base_title.strip()
-                
-                # Extract age group if present
-                age_match = re.search(r'\[Ages?\s*(\d+-\d+)\]|\(Ages?\s*(\d+-\d+)\)', title)
-                age_group = age_match.group(1) or age_match.group(2) if age_match else None
-                
-                # Create unique key that includes age group to keep them separate
-                if age_group:
-                    unique_key = f"{base_title} [Ages {age_group}]"
-                else:
-                    unique_key = base_title
-                
-                if unique_key not in activities_by_base_title:
-                    activities_by_base_title[unique_key] = {
-                        'events': [],
-                        'dates': set(),
-                        'locations': set(),
-                        'times': set(),
-                        'base_title': base_title,
-                        'age_group': age_group
-                    }
-                
-                date = format_date(event['start'])
-                time = format_time(event['start'])
-                end_time = format_end_time(event.get('end', ''))
-                activities_by_base_title[unique_key]['events'].append(event)
-                activities_by_base_title[unique_key]['dates'].add(date)
-                activities_by_base_title[unique_key]['times'].add(time)
-                if event.get('end'):
-                    activities_by_base_title[unique_key]['end_times'] = activities_by_base_title[unique_key].get('end_times', set())
-                    activities_by_base_title[unique_key]['end_times'].add(end_time)
-                if event.get('location'):
-                    activities_by_base_title[unique_key]['locations'].add(event['location'])
+            # Extract age group if present
+            age_match = _AGE_GROUP_RE.search(title)
+            age_group = age_match.group(1) or age_match.group(2) if age_match else None
             
-            for unique_key, info in activities_by_base_title.items():
-                events = info['events']
-                dates = sorted(info['dates'], key=lambda x: datetime.strptime(x, '%B %d'))
-                times = sorted(info['times'])
-                end_times = sorted(info.get('end_times', set()))
-                locations = list(info['locations'])
-                base_title = info['base_title']
-                age_group = info['age_group']
-                
-                # Create event text
-                event_text = base_title
-                
-                # Add age group if present
-                if age_group:
-                    event_text += f" [Ages {age_group}]"
-                
-                if locations:
-                    event_text += f" – {', '.join(locations)}"
-                
-                # Enhanced logic to determine if it's a daily/recurring event
-                title_lower = base_title.lower()
-                is_recurring_by_keywords = any(word in title_lower for word in ['camp', 'daily', 'weekly', 'ongoing', 'recurring', 'class', 'program', 'club', 'ride', 'bus'])
-                
-                # Check if events span multiple days or appear frequently
-                date_objects = [datetime.strptime(date, '%B %d') for date in dates]
-                date_range_days = (max(date_objects) - min(date_objects)).days + 1
-                events_per_day = len(events) / len(dates) if dates else 0
-                
-                # Consider it daily if:
-                # 1. Has recurring keywords, OR
-                # 2. Spans multiple days, OR  
-                # 3. Has multiple events per day (like different age groups)
-                is_daily = (is_recurring_by_keywords or 
-                           len(dates) > 1 or 
-                           events_per_day > 1)
-                
-                if is_daily:
-                    # Daily event - show as daily with all times
-                    if end_times and len(end_times) == len(times):
-                        # Show start-end time pairs
-                        time_pairs = []
-                        for i, start_time in enumerate(times):
-                            if i < len(end_times):
-                                time_pairs.append(f"{start_time}-{end_times[i]}")
-                            else:
-                                time_pairs.append(start_time)
-                        event_text += f" (daily, {', '.join(time_pairs)})"
-                    else:
-                        # Just show start times
-                        event_text += f" (daily, {', '.join(times)})"
-                else:
-                    # Single day event - show date and time
-                    if end_times and len(end_times) == len(times):
-                        # Show start-end time pairs
-                        time_pairs = []
-                        for i, start_time in enumerate(times):
-                            if i < len(end_times):
-                                time_pairs.append(f"{start_time}-{end_times[i]}")
-                            else:
-                                time_pairs.append(start_time)
-                        event_text += f" ({dates[0]}, {', '.join(time_pairs)})"
-                    else:
-                        # Just show start times
-                        event_text += f" ({dates[0]}, {', '.join(times)})"
-                
-                html_content += f'''
-                            <div style="margin-bottom: 8px; font-size: 15px; line-height: 1.4; color: #2c3e50;">• {event_text}</div>
-                '''
+            # Create unique key that includes age group to keep them separate
+            if age_group:
+                unique_key = f"{base_title} [Ages {age_group}]"
+            else:
+                unique_key = base_title
             
-            html_content += '''
-                        </div>
-            '''
+            derived = (unique_key, base_title, age_group, event_date(event['start']),
+                       format_time(event['start']), format_end_time(event.get('end', '')))
+            derived_by_event[id(event)] = derived
+        unique_key, base_title, age_group, start_date, time, end_time = derived
         
-        html_content += '''
-                    </div>
-                </div>
-        '''
-    
-    html_content += '''
-                <!-- Professional Footer -->
-                <div style="text-align: center; color: #7f8c8d; margin-top: 30px; padding: 20px; border-top: 1px solid #ecf0f1; background-color: #f8f9fa;">
-                    <p style="margin: 0; font-size: 14px;">This email was automatically generated from your Google Calendar data.</p>
-                    <p style="margin: 5px 0 0 0; font-size: 12px; opacity: 0.7;">Powered by Calendar Summary Bot</p>
-                </div>
-            </div>
-        </div>
-    </body>
-    </html>
-    '''
+        # Look the group up once and create it on first use
+        info = events_by_base_title.get(unique_key)
+        if info is None:
+            info = events_by_base_title[unique_key] = {
+                'events': [],
+                'dates': set(),
+                'locations': set(),
+                'times': set(),
+                'end_times': set(),
+                'base_title': base_title,
+                'age_group': age_group
+            }
+        
+        info['events'].append(event)
+        info['dates'].add(start_date)
+        info['times'].add(time)
+        if event.get('end'):
+            info['end_times'].add(end_time)
+        if event.get('location'):
+            info['locations'].add(event['location'])
+    
+    lines = []
+    for unique_key, info in events_by_base_title.items():
+        events = info['events']
+        dates = sorted(info['dates'])
+        times = sorted(info['times'])
+        end_times = sorted(info['end_times'])
+        locations = list(info['locations'])
+        base_title = info['base_title']
+        age_group = info['age_group']
+        
+        # Create event text
+        event_text = base_title
+        
+        # Add age group if present
+        if age_group:
+            event_text += f" [Ages {age_group}]"
+        
+        if locations:
+            event_text += f" – {', '.join(locations)}"
+        
+        # Enhanced logic to determine if it's a daily/recurring event
+        title_lower = base_title.lower()
+        is_recurring_by_keywords = any(word in title_lower for word in recurring_keywords)
+        
+        # Check if events appear frequently
+        events_per_day = len(events) / len(dates) if dates else 0
+        
+        # Consider it daily if:
+        # 1. Has recurring keywords, OR
+        # 2. Spans multiple days, OR  
+        # 3. Has multiple events per day (like different age groups)
+        is_daily = (is_recurring_by_keywords or 
+                   len(dates) > 1 or 
+                   events_per_day > 1)
+        
+        # Show start-end time pairs when every start time has an end time
+        if end_times and len(end_times) == len(times):
+            time_pairs = ', '.join(f"{start_time}-{end_time}" for start_time, end_time in zip(times, end_times))
+        else:
+            time_pairs = ', '.join(times)
+        
+        if is_daily:
+            # Daily event - show as daily with all times
+            event_text += f" (daily, {time_pairs})"
+        elif show_single_day_end_times:
+            # Single day event - show date and time
+            event_text += f" ({_fmt_month_day(dates[0])}, {time_pairs})"
+        else:
+            # Single day event - show date and start times
+            event_text += f" ({_fmt_month_day(dates[0])}, {', '.join(times)})"
+        
+        lines.append(event_text)
     
-    return html_content
+    return lines
 
-def clean_booking_url(url):
+def clean_booking_url(url: str) -> str:
     """
     Clean booking URL by removing HTML tags and extra characters.
     
@@ -586,11 +360,13 @@ def clean_booking_url(url):
         return ""
     
     # Remove HTML tags like <b>BOOK</b>, <b>Check</b>, etc.
-    url = re.sub(r'<[^>]+>', '', url)
+    url = _TAG_RE.sub('', url)
+    
+    # Decode HTML entities (like &amp;) so the template escapes them exactly once
+    url = html.unescape(url)
     
     # Remove common text that might be appended to URLs
-    url = re.sub(r'">[^"]*$', '', url)  # Remove "> followed by any text
-    url = re.sub(r'">$', '', url)       # Remove just "> at the end
+    url = _TRAILING_TAG_TEXT_RE.sub('', url)  # Remove "> and any text after it (or just "> at the end)
     
     # Clean up any remaining quotes or special characters
     url = url.strip('"').strip("'").strip()
@@ -601,7 +377,7 @@ def clean_booking_url(url):
     
     return url
 
-def create_events_table(events):
+def create_events_table(events: list[dict]) -> str:
     """
     Create an HTML table for events with proper borders and auto-fitted content.
     
@@ -665,7 +441,18 @@ def create_events_table(events):
     
     return table_html
 
-def format_date(time_str):
+def event_date(time_str: str) -> date:
+    """
+    Get the calendar date of an event time string, as written (the same date format_date shows).
+    
+    :param time_str: ISO format time string
+    :return: date object
+    """
+    if 'T' in time_str:
+        return datetime.fromisoformat(time_str.replace('Z', '+00:00')).date()
+    return date.fromisoformat(time_str)
+
+def format_date(time_str: str) -> str:
     """
     Format date string for display.
     
@@ -676,18 +463,17 @@ def format_date(time_str):
         # Has time component
         try:
             dt = datetime.fromisoformat(time_str.replace('Z', '+00:00'))
-            return dt.strftime('%B %d')
+            return _fmt_month_day(dt)
         except:
             return time_str.split('T')[0]
     else:
         # Date only
         try:
-            dt = datetime.strptime(time_str, '%Y-%m-%d')
-            return dt.strftime('%B %d')
+            return _fmt_month_day(date.fromisoformat(time_str))
         except:
             return time_str
 
-def format_time(time_str):
+def format_time(time_str: str) -> str:
     """
     Format time string for display.
     
@@ -698,18 +484,17 @@ def format_time(time_str):
         # Has time component
         try:
             dt = datetime.fromisoformat(time_str.replace('Z', '+00:00'))
-            return dt.strftime('%I:%M%p')
+            return _fmt_time(dt)
         except:
             return time_str
     else:
         # Date only
         try:
-            dt = datetime.strptime(time_str, '%Y-%m-%d')
-            return dt.strftime('%B %d, %Y')
+            return _fmt_month_day_year(date.fromisoformat(time_str))
         except:
             return time_str
 
-def format_end_time(time_str):
+def format_end_time(time_str: str) -> str:
     """
     Format end time string for display.
     
@@ -720,7 +505,7 @@ def format_end_time(time_str):
         # Has time component
         try:
             dt = datetime.fromisoformat(time_str.replace('Z', '+00:00'))
-            return dt.strftime('%I:%M%p')
+            return _fmt_time(dt)
         except:
             return time_str
     else:
@@ -731,6 +516,21 @@ def send_calendar_email(calendar_data, subject=None):
     """
     Send calendar data via email.
     
+    Synchronous wrapper around send_calendar_email_async for existing callers.
+    
+    :param calendar_data: Dictionary containing categorized events
+    :param subject: Email subject (optional)
+    :return: Boolean indicating success/failure
+    """
+    return asyncio.run(send_calendar_email_async(calendar_data, subject))
+
+async def send_calendar_email_async(calendar_data, subject=None):
+    """
+    Send calendar data via email without blocking on SMTP I/O.
+    
+    The SMTP connection (TCP connect + STARTTLS handshake) is started first and
+    the HTML body is built in a worker thread while the handshake is in flight.
+    
     :param calendar_data: Dictionary containing categorized events
     :param subject: Email subject (optional)
     :return: Boolean indicating success/failure
@@ -743,36 +543,42 @@ def send_calendar_email(calendar_data, subject=None):
         # Create subject with date range
         if calendar_data:
             sorted_dates = sorted(calendar_data.keys())
-            start_date = datetime.strptime(sorted_dates[0], '%Y-%m-%d')
-            end_date = datetime.strptime(sorted_dates[-1], '%Y-%m-%d')
+            start_date = date.fromisoformat(sorted_dates[0])
+            end_date = date.fromisoformat(sorted_dates[-1])
             
             if start_date == end_date:
-                date_range = start_date.strftime('%b %d')
+                date_range = _fmt_short_month_day(start_date)
             else:
-                date_range = f"{start_date.strftime('%b %d')}-{end_date.strftime('%b %d')}"
+                date_range = f"{_fmt_short_month_day(start_date)}-{_fmt_short_month_day(end_date)}"
             
             subject = f"📅 Calendar Summary - {date_range}"
         else:
-            subject = f"📅 Calendar Summary - {datetime.now().strftime('%b %d')}"
+            subject = f"📅 Calendar Summary - {_fmt_short_month_day(datetime.now())}"
     
+    smtp = aiosmtplib.SMTP(hostname=SMTP_SERVER, port=SMTP_PORT, start_tls=True) # Use STARTTLS
+    connect_task = None
     try:
+        # Start connecting while the HTML content is being built
+        connect_task = asyncio.create_task(smtp.connect())
+        
+        # Create HTML content, streaming the template output into a buffer
+        loop = asyncio.get_running_loop()
+        html_buffer = io.StringIO()
+        await loop.run_in_executor(None, html_buffer.writelines, iter_html_chunks(calendar_data))
+        
         # Create message using EmailMessage
         msg = EmailMessage()
         msg['Subject'] = subject
         msg['From'] = EMAIL_USER
         msg['To'] = RECIPIENT_EMAIL
-        
-        # Create HTML content
-        html_content = format_calendar_data_for_email(calendar_data)
-        msg.set_content(html_content, subtype='html')
+        msg.set_content(html_buffer.getvalue(), subtype='html')
         
         # Send email
         print(f"📧 Sending email to {RECIPIENT_EMAIL}...")
         
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls() # Use STARTTLS
-            server.login(EMAIL_USER, EMAIL_PASSWORD)
-            server.send_message(msg)
+        await connect_task
+        await smtp.login(EMAIL_USER, EMAIL_PASSWORD)
+        await smtp.send_message(msg)
         
         print("✅ Email sent successfully!")
         return True
@@ -780,8 +586,16 @@ def send_calendar_email(calendar_data, subject=None):
     except Exception as e:
         print(f"❌ Failed to send email: {str(e)}")
         return False
+    finally:
+        if connect_task and not connect_task.done():
+            connect_task.cancel()
+        if smtp.is_connected:
+            try:
+                await smtp.quit()
+            except aiosmtplib.SMTPException:
+                smtp.close()
 
-def create_plain_text_version(calendar_data):
+def create_plain_text_version(calendar_data: dict) -> str:
     """
     Create a plain text version of the calendar data for email fallback with tabular format.
     
@@ -795,16 +609,18 @@ def create_plain_text_version(calendar_data):
     text_content += "=" * 50 + "\n\n"
     
     sorted_dates = sorted(calendar_data.keys())
+    # Fetch each date's event lists once for the loop below
+    events_per_date = {date_key: (calendar_data[date_key]['ongoing_events'], calendar_data[date_key]['one_time_events'])
+                       for date_key in sorted_dates}
     
-    for date in sorted_dates:
-        date_obj = datetime.strptime(date, '%Y-%m-%d')
-        formatted_date = date_obj.strftime('%A, %B %d, %Y')
+    for date_key in sorted_dates:
+        date_obj = date.fromisoformat(date_key)
+        formatted_date = _fmt_full_date(date_obj)
         
         text_content += f"Date: {formatted_date}\n"
         text_content += "-" * len(f"Date: {formatted_date}") + "\n\n"
         
-        ongoing_events = calendar_data[date]['ongoing_events']
-        one_time_events = calendar_data[date]['one_time_events']
+        ongoing_events, one_time_events = events_per_date[date_key]
         
         if ongoing_events:
             text_content += "🔄 Ongoing Events:\n"
@@ -822,7 +638,7 @@ def create_plain_text_version(calendar_data):
     text_content += "\nThis email was automatically generated from your Google Calendar data."
     return text_content
 
-def create_plain_text_table(events):
+def create_plain_text_table(events: list[dict]) -> str:
     """
     Create a plain text table for events.
     
@@ -866,7 +682,7 @@ def create_plain_text_table(events):
     table_text += "\n"
     return table_text 
 
-def get_event_emoji(title):
+def get_event_emoji(title: str) -> str:
     """
     Get appropriate emoji based on event title.
     
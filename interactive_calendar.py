@@ -6,17 +6,61 @@ This script provides a user-friendly interface for fetching calendar events
 for custom date ranges without needing to remember command line arguments.
 """
 
+import io
 import os
 import sys
+import threading
 from datetime import datetime, timedelta, timezone
 import calendar
+import logging
+from concurrent.futures import Future
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
 # Import the main calendar functions
-from script import get_events_for_custom_range, send_calendar_email, GOOGLE_CALENDAR_NAME
+from script import authenticate_google_calendar, clear_events_cache, get_events_for_custom_range, parse_custom_date_range, send_calendar_email, GOOGLE_CALENDAR_NAME, LOG_LEVEL
+
+_worker_output = threading.local()
+
+class _ThreadBufferedStream:
+    """Stand-in for a console stream that sends a worker thread's writes to its buffer."""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def write(self, text):
+        return getattr(_worker_output, 'buffer', self._stream).write(text)
+
+    def flush(self):
+        getattr(_worker_output, 'buffer', self._stream).flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+def start_background_fetch(calendar_name, date_range, output):
+    """
+    Fetch events on a daemon thread so a pending request never blocks exit.
+
+    :param calendar_name: Name of the calendar to fetch from
+    :param date_range: Date range string (None for the current week)
+    :param output: Buffer that collects whatever the fetch prints
+    :return: Future holding the fetched events
+    """
+    future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        _worker_output.buffer = output
+        try:
+            future.set_result(get_events_for_custom_range(calendar_name, date_range))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, daemon=True).start()
+    return future
 
 def display_menu():
     """Display the main menu options."""
@@ -32,6 +76,7 @@ def display_menu():
     print("5. Custom date range (e.g., Aug 1 to Aug 4)")
     print("6. Specific month (e.g., August 2024)")
     print("7. Exit")
+    print("8. Refresh (fetch again instead of reusing recent results)")
     print()
 
 def get_custom_date_range():
@@ -80,7 +125,6 @@ def get_specific_month():
                 return None
             
             # Test if the input is valid by trying to parse it
-            from script import parse_custom_date_range
             time_min, time_max = parse_custom_date_range(month_input)
             
             if time_min and time_max:
@@ -121,87 +165,118 @@ def main():
     
     print(f"📅 Connected to calendar: {calendar_name}")
     
-    while True:
-        display_menu()
-        
-        try:
-            choice = input("Enter your choice (1-7): ").strip()
+    # Events are fetched in the background while the user picks an email option;
+    # the fetch's prints and log messages are held back so they don't land on the prompt
+    real_stdout = sys.stdout
+    sys.stdout = _ThreadBufferedStream(real_stdout)
+    console_handlers = {handler: handler.stream for handler in logging.getLogger().handlers
+                        if isinstance(handler, logging.StreamHandler)
+                        and handler.stream in (real_stdout, sys.stderr)}
+    for handler, stream in console_handlers.items():
+        handler.setStream(_ThreadBufferedStream(stream))
+    
+    try:
+        while True:
+            display_menu()
+            events_future = None
             
-            if choice == "1":
-                date_range = None  # Default current week
-                print("\n🎯 Fetching events for current week...")
-                
-            elif choice == "2":
-                date_range = "next week"
-                print("\n🎯 Fetching events for next week...")
-                
-            elif choice == "3":
-                date_range = "this month"
-                print("\n🎯 Fetching events for this month...")
+            try:
+                choice = input("Enter your choice (1-8): ").strip()
                 
-            elif choice == "4":
-                date_range = "next month"
-                print("\n🎯 Fetching events for next month...")
-                
-            elif choice == "5":
-                date_range = get_custom_date_range()
-                if not date_range:
+                if choice == "1":
+                    date_range = None  # Default current week
+                    print("\n🎯 Fetching events for current week...")
+                    
+                elif choice == "2":
+                    date_range = "next week"
+                    print("\n🎯 Fetching events for next week...")
+                    
+                elif choice == "3":
+                    date_range = "this month"
+                    print("\n🎯 Fetching events for this month...")
+                    
+                elif choice == "4":
+                    date_range = "next month"
+                    print("\n🎯 Fetching events for next month...")
+                    
+                elif choice == "5":
+                    date_range = get_custom_date_range()
+                    if not date_range:
+                        continue
+                    print(f"\n🎯 Fetching events for: {date_range}")
+                    
+                elif choice == "6":
+                    date_range = get_specific_month()
+                    if not date_range:
+                        continue
+                    print(f"\n🎯 Fetching events for: {date_range}")
+                    
+                elif choice == "7":
+                    print("\n👋 Goodbye!")
+                    break
+                    
+                elif choice == "8":
+                    clear_events_cache()
+                    print("\n🔄 Cleared recently fetched results. The next range will be fetched fresh.")
                     continue
-                print(f"\n🎯 Fetching events for: {date_range}")
-                
-            elif choice == "6":
-                date_range = get_specific_month()
-                if not date_range:
+                    
+                else:
+                    print("❌ Invalid choice. Please enter a number between 1 and 8.")
                     continue
-                print(f"\n🎯 Fetching events for: {date_range}")
                 
-            elif choice == "7":
-                print("\n👋 Goodbye!")
-                break
+                # Sign in up front so a first-run browser login isn't hidden behind the prompt
+                authenticate_google_calendar()
                 
-            else:
-                print("❌ Invalid choice. Please enter a number between 1 and 7.")
-                continue
-            
-            # Get email preference
-            send_email = get_email_preference()
-            
-            # Fetch events
-            print("\n⏳ Fetching calendar events...")
-            events = get_events_for_custom_range(calendar_name, date_range)
-            
-            if events:
-                if send_email:
-                    print("\n📧 Sending email...")
-                    email_sent = send_calendar_email(events)
-                    if email_sent:
-                        print("🎉 Calendar data has been sent via email!")
+                # Start fetching events, then get email preference while the request is in flight
+                print("\n⏳ Fetching calendar events...")
+                fetch_output = io.StringIO()
+                events_future = start_background_fetch(calendar_name, date_range, fetch_output)
+                send_email = get_email_preference()
+                
+                try:
+                    events = events_future.result()
+                finally:
+                    print(fetch_output.getvalue(), end="")
+                
+                if events:
+                    if send_email:
+                        print("\n📧 Sending email...")
+                        email_sent = send_calendar_email(events)
+                        if email_sent:
+                            print("🎉 Calendar data has been sent via email!")
+                        else:
+                            print("⚠️  Email sending failed, but calendar data was saved to JSON file.")
                     else:
-                        print("⚠️  Email sending failed, but calendar data was saved to JSON file.")
+                        print("\n✅ Calendar data saved to JSON file only.")
+                    
+                    # Show summary
+                    total_events = sum(len(day['one_time_events']) + len(day['ongoing_events']) 
+                                     for day in events.values())
+                    print(f"📊 Summary: {total_events} events across {len(events)} days")
+                    
                 else:
-                    print("\n✅ Calendar data saved to JSON file only.")
-                
-                # Show summary
-                total_events = sum(len(day['one_time_events']) + len(day['ongoing_events']) 
-                                 for day in events.values())
-                print(f"📊 Summary: {total_events} events across {len(events)} days")
+                    print("📭 No events found for the specified date range.")
                 
-            else:
-                print("📭 No events found for the specified date range.")
-            
-            # Ask if user wants to continue
-            print("\n" + "-" * 40)
-            continue_choice = input("Would you like to fetch another date range? (y/n): ").strip().lower()
-            if continue_choice not in ['y', 'yes']:
-                print("\n👋 Goodbye!")
+                # Ask if user wants to continue
+                print("\n" + "-" * 40)
+                continue_choice = input("Would you like to fetch another date range? (y/n): ").strip().lower()
+                if continue_choice not in ['y', 'yes']:
+                    print("\n👋 Goodbye!")
+                    break
+                    
+            except KeyboardInterrupt:
+                if events_future is not None:
+                    events_future.cancel()
+                print("\n\n👋 Goodbye!")
                 break
-                
-        except KeyboardInterrupt:
-            print("\n\n👋 Goodbye!")
-            break
-        except Exception as e:
-            print(f"\n❌ An error occurred: {e}")
-            print("Please try again.")
+            except Exception as e:
+                print(f"\n❌ An error occurred: {e}")
+                print("Please try again.")
+    finally:
+        sys.stdout = real_stdout
+        for handler, stream in console_handlers.items():
+            handler.setStream(stream)
 
 if __name__ == "__main__":
+    logging.basicConfig(level=LOG_LEVEL, format='%(message)s')
     main() 
\ No newline at end of file
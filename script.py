@@ -1,42 +1,92 @@
-import os, pickle, json, html, re
+import os, sys, json, html, re
 from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
-from datetime import datetime, timedelta, timezone
+from googleapiclient.errors import HttpError
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
 import argparse
 import calendar
+import itertools
+import logging
+from collections import defaultdict
+from functools import lru_cache
+from cachetools import TTLCache
 
 from email_sender import send_calendar_email
 
+try:
+    import orjson
+except ImportError: # orjson is optional; JSON output then uses the standard json module
+    orjson = None
+
+try:
+    import re2 as _desc_re
+except ImportError: # re2 is optional; description scanning then uses the standard re module
+    _desc_re = re
+
 from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Get configuration from environment variables
 GOOGLE_CALENDAR_NAME = os.getenv('GOOGLE_CALENDAR_NAME', '')
 GOOGLE_CREDENTIALS_FILE = os.getenv('GOOGLE_CREDENTIALS_FILE', '')
 GOOGLE_TOKEN_FILE = os.getenv('GOOGLE_TOKEN_FILE', '')
+CALENDAR_ID_CACHE_FILE = os.getenv('CALENDAR_ID_CACHE_FILE',
+                                   os.path.join(os.path.dirname(GOOGLE_TOKEN_FILE), '.cal_id_cache.json'))
 OUTPUT_JSON_FILE = os.getenv('OUTPUT_JSON_FILE', '')
 MAX_RESULTS = int(os.getenv('MAX_RESULTS', '100000'))
+EVENTS_PAGE_SIZE = 250 # Events per Calendar API result page
 ENABLE_HTML_CLEANING = os.getenv('ENABLE_HTML_CLEANING', 'false').lower() == 'true'
+PRETTY_JSON_OUTPUT = os.getenv('PRETTY_JSON_OUTPUT', 'false').lower() == 'true' # Indent OUTPUT_JSON_FILE for reading
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'WARNING').upper() # DEBUG shows per-event details while fetching
+if not isinstance(logging.getLevelName(LOG_LEVEL), int):
+    print(f"⚠️  Unknown LOG_LEVEL '{LOG_LEVEL}', using WARNING (choose DEBUG, INFO, WARNING, ERROR or CRITICAL)")
+    LOG_LEVEL = 'WARNING'
+
+# Fields requested from the Calendar API (partial responses)
+EVENT_LIST_FIELDS = 'nextPageToken,items(summary,location,description,start(dateTime,date),end(dateTime,date))'
+CALENDAR_LIST_FIELDS = 'nextPageToken,items(id,summary)'
+
+# Recently fetched results per (calendar name, date range), kept for 5 minutes
+_EVENTS_CACHE = TTLCache(maxsize=16, ttl=300)
 
 # Define the scopes required
 SCOPES = [os.getenv('GOOGLE_CALENDAR_SCOPES', 'https://www.googleapis.com/auth/calendar.readonly')]
 
-# Pacific Time timezone (Los Angeles)
-PACIFIC_TZ = timezone(timedelta(hours=-8))  # PST (UTC-8)
-PACIFIC_DT_TZ = timezone(timedelta(hours=-7))  # PDT (UTC-7) - Daylight Saving Time
+# Pacific Time timezone (Los Angeles), switching between PST and PDT with daylight saving time
+PACIFIC = ZoneInfo('America/Los_Angeles')
+
+# datetime.fromisoformat accepts a trailing 'Z' (UTC) from Python 3.11 on
+_FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
 
-def get_pacific_time():
+@lru_cache(maxsize=4096)
+def _parse_datetime_cached(date_time_str):
     """
-    Get current time in Pacific Time (Los Angeles).
-    Automatically handles Daylight Saving Time.
+    Parse a date or datetime string into a Pacific Time datetime.
+    Results are cached, since many events share the same start/end strings.
+    
+    :param date_time_str: String like "2025-07-21" or "2025-07-21T10:30:00-07:00"
+    :return: datetime object in Pacific Time
+    :raises ValueError: If the string is not a valid date or datetime
     """
-    utc_now = datetime.now(timezone.utc)
-    # Pacific Time is UTC-8 (PST) or UTC-7 (PDT)
-    # We'll use UTC-7 as default (PDT) since most of the year is daylight saving
-    pacific_now = utc_now.astimezone(PACIFIC_DT_TZ)
-    return pacific_now
+    if len(date_time_str) == 10:
+        # Date only ("YYYY-MM-DD"), assume start of day in Pacific Time
+        return datetime.fromisoformat(date_time_str).replace(tzinfo=PACIFIC)
+    
+    # Has time component, parse with timezone
+    if not _FROMISOFORMAT_ACCEPTS_Z:
+        date_time_str = date_time_str.replace('Z', '+00:00')
+    dt = datetime.fromisoformat(date_time_str)
+    if dt.tzinfo is None:
+        # If no timezone info, assume it's in Pacific Time
+        return dt.replace(tzinfo=PACIFIC)
+    # Convert to Pacific Time
+    return dt.astimezone(PACIFIC)
 
 def parse_datetime_with_timezone(date_time_str):
     """
@@ -45,48 +95,55 @@ def parse_datetime_with_timezone(date_time_str):
     Converts all times to Pacific Time.
     
     :param date_time_str: String like "2025-07-21" or "2025-07-21T10:30:00-07:00"
-    :return: datetime object in Pacific Time
+    :return: datetime object in Pacific Time, or None if it could not be parsed
     """
-    if 'T' in date_time_str:
-        # Has time component, parse with timezone
-        try:
-            # Parse the datetime string
-            dt = datetime.fromisoformat(date_time_str.replace('Z', '+00:00'))
-            # Convert to Pacific Time
-            if dt.tzinfo is None:
-                # If no timezone info, assume it's in Pacific Time
-                dt = dt.replace(tzinfo=PACIFIC_DT_TZ)
-            else:
-                # Convert to Pacific Time
-                dt = dt.astimezone(PACIFIC_DT_TZ)
-            return dt
-        except ValueError as e:
-            print(f"Warning: Could not parse datetime '{date_time_str}': {e}")
-            return None
-    else:
-        # Date only, assume start of day in Pacific Time
-        try:
-            dt = datetime.strptime(date_time_str, '%Y-%m-%d')
-            dt = dt.replace(tzinfo=PACIFIC_DT_TZ)
-            return dt
-        except ValueError as e:
-            print(f"Warning: Could not parse date '{date_time_str}': {e}")
-            return None
+    try:
+        return _parse_datetime_cached(date_time_str)
+    except ValueError as e:
+        kind = 'datetime' if 'T' in date_time_str else 'date'
+        print(f"Warning: Could not parse {kind} '{date_time_str}': {e}")
+        return None
+
+# Regexes used for every event description, compiled once.
+# Tag stripping stays on the standard re module, which is much faster than re2 for this simple pattern
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# Booking links use re2 when available, so the <a href=...> alternative runs in linear time;
+# flags are written inline ((?i)) since re2 has no re.IGNORECASE.
+# re2 cannot backtrack, so its URL token needs no length bound (it also rejects repeats over 1000);
+# with re, URLs are cut off after 2048 characters instead
+_URL_TOKEN = r'[^\s<>"\')]+' if _desc_re is not re else r'[^\s<>"\')]{1,2048}'
+
+# Common patterns for booking links, fused into one alternation so each description
+# is scanned once; the named group that matched holds the link
+_BOOKING_RE = _desc_re.compile('(?i)' + '|'.join((
+    # Look for "Book Now" or similar text followed by URLs
+    r'(?:book\s+now|book\s+here|reserve\s+now|book\s+appointment|schedule\s+now)[\s:]*(?P<after_text>[^\s\n]+)',
+    # Look for button-style links in HTML
+    r'<a[^>]*href=["\'](?P<button_href>[^"\']+)["\'][^>]*>(?:[^<]*book[^<]*|[^<]*reserve[^<]*|[^<]*schedule[^<]*)</a>',
+    # Any other URL, as a single token; kept only if it contains a booking keyword
+    rf'(?P<url>https?://{_URL_TOKEN})'
+)))
+
+# Keywords (and booking platforms) that mark a plain URL as a booking link
+_BOOKING_URL_KEYWORDS = ('book', 'reserve', 'reservation', 'appointment', 'schedule',
+                         'calendly', 'acuity', 'square', 'mindbody', 'zenoti')
 
 def clean_html_text(text):
     """Remove HTML tags and decode HTML entities from text."""
     if not text:
         return ''
     
-    # Decode HTML entities (like &amp;, &lt;, etc.)
-    text = html.unescape(text)
+    # Decode HTML entities (like &amp;, &lt;, etc.); plain text has none to decode
+    if '&' in text:
+        text = html.unescape(text)
     
     # Simple HTML tag removal (you can use a more robust library like BeautifulSoup if needed)
-    import re
-    # Remove HTML tags
-    text = re.sub(r'<[^>]+>', '', text)
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
+    # Remove HTML tags (checked after decoding, since &lt;b&gt; decodes to a tag)
+    if '<' in text:
+        text = _TAG_RE.sub('', text)
+    # Remove extra whitespace (str.split collapses the same whitespace as \s+, without a regex pass)
+    text = ' '.join(text.split())
     
     return text
 
@@ -102,47 +159,40 @@ def extract_booking_links(description):
         return []
     
     booking_links = []
+    for match in _BOOKING_RE.finditer(description):
+        # Clean up the URL
+        url = match.group(match.lastgroup).strip()
+        if match.lastgroup == 'url':
+            lowered = url.lower()
+            if not any(keyword in lowered for keyword in _BOOKING_URL_KEYWORDS):
+                continue
+        if url.startswith('http'):
+            booking_links.append(url)
     
-    # Common patterns for booking links
-    patterns = [
-        # Look for "Book Now" or similar text followed by URLs
-        r'(?:book\s+now|book\s+here|reserve\s+now|book\s+appointment|schedule\s+now)[\s:]*([^\s\n]+)',
-        # Look for URLs that might be booking links
-        r'(https?://[^\s\n]+(?:book|reserve|appointment|schedule)[^\s\n]*)',
-        # Look for common booking platforms
-        r'(https?://[^\s\n]*(?:calendly|acuity|square|booksy|mindbody|zenoti)[^\s\n]*)',
-        # Look for button-style links in HTML
-        r'<a[^>]*href=["\']([^"\']+)["\'][^>]*>(?:[^<]*book[^<]*|[^<]*reserve[^<]*|[^<]*schedule[^<]*)</a>',
-        # Look for any URL that contains booking-related keywords
-        r'(https?://[^\s\n]*(?:booking|appointment|reservation|schedule)[^\s\n]*)'
-    ]
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, description, re.IGNORECASE)
-        for match in matches:
-            # Clean up the URL
-            url = match.strip()
-            if url.startswith('http'):
-                booking_links.append(url)
-    
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_links = []
-    for link in booking_links:
-        if link not in seen:
-            seen.add(link)
-            unique_links.append(link)
-    
-    return unique_links
+    # dict.fromkeys drops duplicates while keeping first-seen order
+    return list(dict.fromkeys(booking_links))
+
+# Calendar API service shared by every call in this process, built on first use
+_SERVICE = None
 
 def authenticate_google_calendar():
-    """Authenticates and returns a Google Calendar API service instance."""
+    """
+    Authenticates and returns a Google Calendar API service instance.
+    The service is built once and reused by later calls; it refreshes its access token as needed.
+    """
+    global _SERVICE
+    if _SERVICE is not None:
+        return _SERVICE
+    
     creds = None
 
     # Token file stores the user's access and refresh tokens
     if os.path.exists(GOOGLE_TOKEN_FILE):
-        with open(GOOGLE_TOKEN_FILE, 'rb') as token:
-            creds = pickle.load(token)
+        try:
+            creds = Credentials.from_authorized_user_file(GOOGLE_TOKEN_FILE, SCOPES)
+        except ValueError:
+            # Not an authorized-user JSON file (e.g. a token pickled by an older version); log in again
+            print(f"⚠️  Could not read {GOOGLE_TOKEN_FILE}, re-authenticating")
 
     # If no valid credentials, let the user log in
     if not creds or not creds.valid:
@@ -153,19 +203,82 @@ def authenticate_google_calendar():
                 GOOGLE_CREDENTIALS_FILE, SCOPES)
             creds = flow.run_local_server(port=0)
         # Save credentials for next run
-        with open(GOOGLE_TOKEN_FILE, 'wb') as token:
-            pickle.dump(creds, token)
+        with open(GOOGLE_TOKEN_FILE, 'w', encoding='utf-8') as token:
+            token.write(creds.to_json())
+
+    # googleapiclient already requests gzip-compressed responses (accept-encoding plus a
+    # "(gzip)" User-Agent suffix); static discovery builds from the bundled discovery document
+    _SERVICE = build('calendar', 'v3', credentials=creds, static_discovery=True, cache_discovery=False)
+    return _SERVICE
+
+def _load_cal_id_cache():
+    """Load the cached {calendar_name: calendar_id} map, or an empty dict if there is none."""
+    try:
+        with open(CALENDAR_ID_CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
 
-    service = build('calendar', 'v3', credentials=creds)
-    return service
+def _save_cal_id_cache(calendar_ids):
+    """Save the {calendar_name: calendar_id} map for later runs."""
+    try:
+        with open(CALENDAR_ID_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(calendar_ids, f, indent=4, ensure_ascii=False)
+    except OSError as e:
+        print(f"Warning: Could not save calendar ID cache '{CALENDAR_ID_CACHE_FILE}': {e}")
+
+def get_calendar_id_by_name(service, calendar_name, use_cache=True):
+    """
+    Finds the calendar ID by its name.
+    
+    Calendar IDs rarely change, so resolved IDs are cached on disk and the
+    calendar list is only fetched on a cache miss (or when use_cache is False).
+    """
+    if use_cache:
+        calendar_id = _load_cal_id_cache().get(calendar_name)
+        if calendar_id:
+            return calendar_id
+    
+    calendar_items = []
+    params = {'fields': CALENDAR_LIST_FIELDS, 'prettyPrint': False}
+    while True:
+        calendar_list = service.calendarList().list(**params).execute()
+        calendar_items.extend(calendar_list.get('items', []))
+        
+        page_token = calendar_list.get('nextPageToken')
+        if not page_token:
+            break
+        params['pageToken'] = page_token
+    
+    # Reversed so the first calendar with a given name wins
+    calendar_ids = {item['summary']: item['id'] for item in reversed(calendar_items)}
+    _save_cal_id_cache(calendar_ids)
+    return calendar_ids.get(calendar_name)
 
-def get_calendar_id_by_name(service, calendar_name):
-    """Finds the calendar ID by its name."""
-    calendar_list = service.calendarList().list().execute()
-    for calendar_item in calendar_list['items']:
-        if calendar_item['summary'] == calendar_name:
-            return calendar_item['id']
-    return None
+def iter_calendar_events(service, params, max_results=None):
+    """
+    Yield events from the Calendar API one result page at a time, following nextPageToken.
+    
+    :param service: Google Calendar API service instance
+    :param params: Query parameters for events().list
+    :param max_results: Max number of events to yield (None for all events)
+    """
+    params = dict(params)
+    params['maxResults'] = min(max_results, EVENTS_PAGE_SIZE) if max_results else EVENTS_PAGE_SIZE
+    
+    yielded = 0
+    while True:
+        events_result = service.events().list(**params).execute()
+        for event in events_result.get('items', []):
+            yield event
+            yielded += 1
+            if max_results and yielded >= max_results:
+                return
+        
+        page_token = events_result.get('nextPageToken')
+        if not page_token:
+            return
+        params['pageToken'] = page_token
 
 def get_events_from_calendar(calendar_name, time_min=None, time_max=None, max_results=None):
     """
@@ -185,9 +298,10 @@ def get_events_from_calendar(calendar_name, time_min=None, time_max=None, max_re
         return
 
     # Set default time range (current week - Monday to Sunday) in Pacific Time
+    if not time_min or not time_max:
+        # Use Pacific Time for all calculations; both bounds share the same "today"
+        today = datetime.now(PACIFIC)
     if not time_min:
-        # Use Pacific Time for all calculations
-        today = get_pacific_time()
         print(f"📅 Week calculation (Pacific Time):")
         print(f"   Today (Pacific): {today.strftime('%Y-%m-%d %H:%M:%S %Z')}")
         print(f"   Today weekday: {today.weekday()} (0=Monday, 6=Sunday)")
@@ -199,7 +313,6 @@ def get_events_from_calendar(calendar_name, time_min=None, time_max=None, max_re
         print(f"   Monday (Pacific): {monday.strftime('%Y-%m-%d %H:%M:%S %Z')}")
         print(f"   Time range start: {time_min}")
     if not time_max:
-        today = get_pacific_time()
         # Get Sunday of current week (weekday 6 = Sunday)
         sunday = today + timedelta(days=6-today.weekday())
         sunday = sunday.replace(hour=23, minute=59, second=59, microsecond=999999)
@@ -215,24 +328,32 @@ def get_events_from_calendar(calendar_name, time_min=None, time_max=None, max_re
         'timeMin': time_min,
         'timeMax': time_max,
         'singleEvents': True,
-        'orderBy': 'startTime'
+        'orderBy': 'startTime',
+        # Only request the fields used below, without pretty-printed JSON
+        'fields': EVENT_LIST_FIELDS,
+        'prettyPrint': False
     }
     
-    # Add maxResults parameter only if specified
-    if max_results:
-        params['maxResults'] = max_results
-    elif MAX_RESULTS:
-        params['maxResults'] = MAX_RESULTS
-    
-    events_result = service.events().list(**params).execute()
-
-    events = events_result.get('items', [])
-    if not events:
+    # Events are fetched page by page and processed as each page arrives
+    events = iter_calendar_events(service, params, max_results or MAX_RESULTS)
+    try:
+        first_event = next(events, None)
+    except HttpError as e:
+        if e.resp.status != 404:
+            raise
+        # The cached calendar ID no longer exists; look the name up again and retry once
+        calendar_id = get_calendar_id_by_name(service, calendar_name, use_cache=False)
+        if not calendar_id:
+            print(f"Calendar with name '{calendar_name}' not found.")
+            return
+        params['calendarId'] = calendar_id
+        events = iter_calendar_events(service, params, max_results or MAX_RESULTS)
+        first_event = next(events, None)
+    
+    if first_event is None:
         print("No upcoming events found in this calendar.")
         return []
-    
-    # Extract the required fields from events and categorize by date
-    categorized_events = {}
+    events = itertools.chain([first_event], events)
     
     print(f"📊 Processing events within week range...")
     
@@ -241,106 +362,172 @@ def get_events_from_calendar(calendar_name, time_min=None, time_max=None, max_re
     week_end_dt = parse_datetime_with_timezone(time_max.split('T')[0])
     
     if week_start_dt and week_end_dt:
-        week_start = week_start_dt.strftime('%Y-%m-%d')
-        week_end = week_end_dt.strftime('%Y-%m-%d')
+        week_start = week_start_dt.date()
+        week_end = week_end_dt.date()
         print(f"   Week range: {week_start} to {week_end}")
     else:
         print("   Warning: Could not parse week boundaries")
         return []
     
+    # Events are categorized as they stream in from the API, one page in memory at a time
+    categorized_events, events_in_range, events_total = categorize_events(events, week_start, week_end)
+    
+    print(f"   📈 Processed {events_in_range} events within week range (out of {events_total} total)")
+    
+    # Save to JSON file
+    save_events_to_json(categorized_events)
+    
+    print(f"Extracted and categorized {events_total} events by date and saved to {OUTPUT_JSON_FILE}")
+    return categorized_events
+
+def parse_event_dates(event):
+    """
+    Parse the start and end of a single Calendar API event in Pacific Time.
+    
+    :param event: Event resource returned by the Calendar API
+    :return: Tuple of (start, end, start_date, end_date), or None if its dates could not be parsed
+    """
+    start = event['start'].get('dateTime', event['start'].get('date'))
+    end = event['end'].get('dateTime', event['end'].get('date'))
+    
+    # Parse start and end dates with proper timezone handling (Pacific Time)
+    start_dt = parse_datetime_with_timezone(start)
+    end_dt = parse_datetime_with_timezone(end)
+    
+    if not start_dt or not end_dt:
+        logger.warning("   ⚠️  Skipping: %s (could not parse dates)", event.get('summary', ''))
+        return None
+    return start, end, start_dt.date(), end_dt.date()
+
+def build_event_data(event, start, end):
+    """
+    Extract the fields used for categorization from a single Calendar API event.
+    
+    :param event: Event resource returned by the Calendar API
+    :param start: Raw start value of the event (dateTime or date)
+    :param end: Raw end value of the event (dateTime or date)
+    :return: Dictionary of event data
+    """
+    # Get the original description for link extraction
+    original_description = event.get('description', '')
+    
+    # Clean the description for display
+    cleaned_description = clean_html_text(original_description) if ENABLE_HTML_CLEANING else original_description
+    
+    # Extract booking links from the original description
+    booking_links = extract_booking_links(original_description)
+    
+    return {
+        'summary': event.get('summary', ''), # This is the title of the event
+        'location': event.get('location', ''), # This is the location of the event
+        'description': cleaned_description, # This is the text description of the event
+        'booking_links': booking_links, # This is the list of booking links found
+        'start': start, # This is the start time of the event
+        'end': end # This is the end time of the event
+    }
+
+@lru_cache(maxsize=1024)
+def _date_key(ordinal):
+    """Return the categorized_events key (ISO date) for a date ordinal; a range only spans a few distinct days."""
+    return date.fromordinal(ordinal).isoformat()
+
+def categorize_events(events, week_start, week_end):
+    """
+    Categorize events by date, consuming them one at a time.
+    
+    :param events: Iterable of Calendar API events (e.g., from iter_calendar_events)
+    :param week_start: First date of the range (date)
+    :param week_end: Last date of the range (date)
+    :return: Tuple of (categorized_events, events_in_range, events_total)
+    """
+    # Each date entry is created on first use
+    categorized_events = defaultdict(lambda: {'ongoing_events': [], 'one_time_events': []})
     events_in_range = 0
+    events_total = 0
     for event in events:
-        print(event)
-        
-        # Get the original description for link extraction
-        original_description = event.get('description', '')
-        
-        # Clean the description for display
-        cleaned_description = clean_html_text(original_description) if ENABLE_HTML_CLEANING else original_description
-        
-        # Extract booking links from the original description
-        booking_links = extract_booking_links(original_description)
-        
-        event_data = {
-            'summary': event.get('summary', ''), # This is the title of the event
-            'location': event.get('location', ''), # This is the location of the event
-            'description': cleaned_description, # This is the text description of the event
-            'booking_links': booking_links, # This is the list of booking links found
-            'start': event['start'].get('dateTime', event['start'].get('date')), # This is the start time of the event
-            'end': event['end'].get('dateTime', event['end'].get('date')) # This is the end time of the event
-        }
-        
-        # Parse start and end dates with proper timezone handling (Pacific Time)
-        start_dt = parse_datetime_with_timezone(event_data['start'])
-        end_dt = parse_datetime_with_timezone(event_data['end'])
+        events_total += 1
         
-        if not start_dt or not end_dt:
-            print(f"   ⚠️  Skipping: {event_data['summary']} (could not parse dates)")
+        parsed = parse_event_dates(event)
+        if parsed is None:
             continue
+        start, end, start_date, end_date = parsed
         
-        start_date = start_dt.strftime('%Y-%m-%d')
-        end_date = end_dt.strftime('%Y-%m-%d')
-        
-        # Check if event overlaps with the week range
-        # Include events that: start_date <= week_end AND end_date >= week_start
-        if end_date < week_start or start_date > week_end:
-            print(f"   ⏭️  Skipping: {event_data['summary']} (outside week range: {start_date} to {end_date})")
+        # timeMin/timeMax compare instants, so an all-day event from a calendar outside
+        # Pacific Time can be returned without any of its dates falling in the week
+        overlap_start = max(start_date, week_start)
+        overlap_end = min(end_date, week_end)
+        if overlap_start > overlap_end:
+            logger.debug("   ⏭️  Skipping: %s (outside week range: %s to %s)", event.get('summary', ''), start_date, end_date)
             continue
-            
+        
+        # Descriptions are only cleaned and scanned for links once the event is known to be in range
         events_in_range += 1
+        event_data = build_event_data(event, start, end)
         
         # Determine if it's an ongoing event (spans multiple days)
         is_ongoing = start_date != end_date
         
-        print(f"   ✅ Event: {event_data['summary']}")
-        print(f"      Start: {event_data['start']} → Date: {start_date}")
-        print(f"      End: {event_data['end']} → Date: {end_date}")
-        print(f"      Type: {'Ongoing' if is_ongoing else 'One-time'}")
+        # Per-event details are debug logs (lazy %s formatting) to keep stdout out of the loop
+        logger.debug("   ✅ Event: %s", event_data['summary'])
+        logger.debug("      Start: %s → Date: %s", event_data['start'], start_date)
+        logger.debug("      End: %s → Date: %s", event_data['end'], end_date)
+        logger.debug("      Type: %s", 'Ongoing' if is_ongoing else 'One-time')
         
         # For ongoing events, add to every day they overlap with the week
         if is_ongoing:
-            # Calculate the actual overlap dates within our week range
-            
-            overlap_start = max(start_date, week_start)
-            overlap_end = min(end_date, week_end)
-            
-            # Convert to datetime for iteration
-            current_date = datetime.strptime(overlap_start, '%Y-%m-%d')
-            end_datetime = datetime.strptime(overlap_end, '%Y-%m-%d')
-            
-            print(f"      Overlap with week: {overlap_start} to {overlap_end}")
+            logger.debug("      Overlap with week: %s to %s", overlap_start, overlap_end)
             
             # Add event to each day it overlaps with the week
-            while current_date <= end_datetime:
-                date_key = current_date.strftime('%Y-%m-%d')
-                
-                # Initialize date entry if it doesn't exist
-                if date_key not in categorized_events:
-                    categorized_events[date_key] = {
-                        'ongoing_events': [],
-                        'one_time_events': []
-                    }
-                
-                categorized_events[date_key]['ongoing_events'].append(event_data)
-                current_date += timedelta(days=1)
+            for ordinal in range(overlap_start.toordinal(), overlap_end.toordinal() + 1):
+                categorized_events[_date_key(ordinal)]['ongoing_events'].append(event_data)
         else:
             # For one-time events, add only to the start date
-            if start_date not in categorized_events:
-                categorized_events[start_date] = {
-                    'ongoing_events': [],
-                    'one_time_events': []
-                }
-            
-            categorized_events[start_date]['one_time_events'].append(event_data)
+            categorized_events[start_date.isoformat()]['one_time_events'].append(event_data)
     
-    print(f"   📈 Processed {events_in_range} events within week range (out of {len(events)} total)")
+    # Return a plain dict so callers and the JSON writers see the same type as before
+    return dict(categorized_events), events_in_range, events_total
+
+def save_events_to_json(categorized_events):
+    """
+    Save categorized events to OUTPUT_JSON_FILE, writing one day at a time.
+    Uses orjson when it is installed, otherwise the standard json module.
+    The JSON is compact unless PRETTY_JSON_OUTPUT is enabled.
     
-    # Save to JSON file
-    with open(OUTPUT_JSON_FILE, 'w', encoding='utf-8') as f:
-        json.dump(categorized_events, f, indent=4, ensure_ascii=False)
+    :param categorized_events: Dictionary of categorized events
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if PRETTY_JSON_OUTPUT else 0
+        dumps = lambda obj: orjson.dumps(obj, option=option)
+    elif PRETTY_JSON_OUTPUT:
+        dumps = lambda obj: json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    else:
+        dumps = lambda obj: json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
     
-    print(f"Extracted and categorized {len(events)} events by date and saved to {OUTPUT_JSON_FILE}")
-    return categorized_events
+    if PRETTY_JSON_OUTPUT:
+        first_sep, item_sep, key_sep, closing = b'\n  ', b',\n  ', b': ', b'\n}'
+    else:
+        first_sep, item_sep, key_sep, closing = b'', b',', b':', b'}'
+    
+    # Serializing per day keeps only one day's JSON in memory instead of the whole file
+    with open(OUTPUT_JSON_FILE, 'wb') as f:
+        f.write(b'{')
+        for i, (date_key, day) in enumerate(categorized_events.items()):
+            f.write(item_sep if i else first_sep)
+            f.write(dumps(str(date_key)))
+            f.write(key_sep)
+            day_json = dumps(day)
+            # Nest each indented day one level under the top-level object
+            f.write(day_json.replace(b'\n', b'\n  ') if PRETTY_JSON_OUTPUT else day_json)
+        f.write(closing if categorized_events else b'}')
+
+# Month names and abbreviations accepted by parse_custom_date_range ("august 2024", "aug 2024")
+_MONTH_MAP = {
+    'january': 1, 'jan': 1, 'february': 2, 'feb': 2, 'march': 3, 'mar': 3,
+    'april': 4, 'apr': 4, 'may': 5, 'june': 6, 'jul': 7, 'july': 7,
+    'august': 8, 'aug': 8, 'september': 9, 'sep': 9, 'october': 10, 'oct': 10,
+    'november': 11, 'nov': 11, 'december': 12, 'dec': 12
+}
+_YEAR_MONTH_RE = re.compile(r'\d{4}-\d{1,2}')
 
 def parse_custom_date_range(date_input):
     """
@@ -360,9 +547,6 @@ def parse_custom_date_range(date_input):
     """
     date_input = date_input.lower().strip()
     
-    # Pacific Time timezone for calculations
-    pacific_tz = timezone(timedelta(hours=-7))  # PDT
-    
     # Handle "to" format: "2024-08-01 to 2024-08-04"
     if " to " in date_input:
         try:
@@ -371,9 +555,9 @@ def parse_custom_date_range(date_input):
             end_date = datetime.strptime(end_date_str.strip(), '%Y-%m-%d')
             
             # Set start time to beginning of start date
-            time_min = start_date.replace(tzinfo=pacific_tz).isoformat()
+            time_min = start_date.replace(tzinfo=PACIFIC).isoformat()
             # Set end time to end of end date
-            time_max = end_date.replace(hour=23, minute=59, second=59, microsecond=999999, tzinfo=pacific_tz).isoformat()
+            time_max = end_date.replace(hour=23, minute=59, second=59, microsecond=999999, tzinfo=PACIFIC).isoformat()
             
             return time_min, time_max
         except ValueError as e:
@@ -381,27 +565,19 @@ def parse_custom_date_range(date_input):
             return None, None
     
     # Handle month formats: "august 2024", "aug 2024", "2024-08"
-    month_keywords = ['january', 'jan', 'february', 'feb', 'march', 'mar', 'april', 'apr', 
-                     'may', 'june', 'jul', 'july', 'august', 'aug', 'september', 'sep', 
-                     'october', 'oct', 'november', 'nov', 'december', 'dec']
+    tokens = date_input.split()
     
-    # Check if input contains month keywords
-    if any(keyword in date_input for keyword in month_keywords) or (len(date_input.split()) == 2 and date_input.split()[1].isdigit()):
+    # Check if input starts with a month name, is "<word> <year>" or is "YYYY-MM"
+    if (tokens and tokens[0] in _MONTH_MAP) or (len(tokens) == 2 and tokens[1].isdigit()) or _YEAR_MONTH_RE.fullmatch(date_input):
         try:
             # Parse month and year
-            if len(date_input.split()) == 2:
-                month_str, year_str = date_input.split()
+            if len(tokens) == 2:
+                month_str, year_str = tokens
                 year = int(year_str)
                 
                 # Handle month names
-                if month_str in month_keywords:
-                    month_map = {
-                        'january': 1, 'jan': 1, 'february': 2, 'feb': 2, 'march': 3, 'mar': 3,
-                        'april': 4, 'apr': 4, 'may': 5, 'june': 6, 'jul': 7, 'july': 7,
-                        'august': 8, 'aug': 8, 'september': 9, 'sep': 9, 'october': 10, 'oct': 10,
-                        'november': 11, 'nov': 11, 'december': 12, 'dec': 12
-                    }
-                    month = month_map[month_str]
+                if month_str in _MONTH_MAP:
+                    month = _MONTH_MAP[month_str]
                 else:
                     raise ValueError(f"Invalid month: {month_str}")
             else:
@@ -409,9 +585,9 @@ def parse_custom_date_range(date_input):
                 year, month = map(int, date_input.split('-'))
             
             # Get first and last day of month
-            first_day = datetime(year, month, 1, tzinfo=pacific_tz)
+            first_day = datetime(year, month, 1, tzinfo=PACIFIC)
             last_day = datetime(year, month, calendar.monthrange(year, month)[1], 
-                              hour=23, minute=59, second=59, microsecond=999999, tzinfo=pacific_tz)
+                              hour=23, minute=59, second=59, microsecond=999999, tzinfo=PACIFIC)
             
             return first_day.isoformat(), last_day.isoformat()
             
@@ -420,7 +596,7 @@ def parse_custom_date_range(date_input):
             return None, None
     
     # Handle relative time periods
-    today = datetime.now(pacific_tz)
+    today = datetime.now(PACIFIC)
     
     if date_input == "next week":
         # Next Monday to Sunday
@@ -467,11 +643,20 @@ def parse_custom_date_range(date_input):
 def get_events_for_custom_range(calendar_name, date_range=None):
     """
     Get events for a custom date range.
+    Results are reused for repeated requests of the same range within a few minutes.
     
     :param calendar_name: Name of the calendar
     :param date_range: String describing the date range (optional)
     :return: Dictionary of categorized events
     """
+    cache_key = (calendar_name, date_range)
+    if cache_key in _EVENTS_CACHE:
+        categorized_events = _EVENTS_CACHE[cache_key]
+        print(f"♻️  Using events fetched in the last few minutes for '{date_range or 'current week'}'")
+        # Another range may have been saved since, so write this one out again
+        save_events_to_json(categorized_events)
+        return categorized_events
+    
     time_min = None
     time_max = None
     
@@ -488,7 +673,16 @@ def get_events_for_custom_range(calendar_name, date_range=None):
         print(f"   End: {time_max}")
         print()
     
-    return get_events_from_calendar(calendar_name, time_min, time_max)
+    categorized_events = get_events_from_calendar(calendar_name, time_min, time_max)
+    if categorized_events:
+        _EVENTS_CACHE[cache_key] = categorized_events
+    return categorized_events
+
+def clear_events_cache():
+    """
+    Forget previously fetched results so the next request goes to the API.
+    """
+    _EVENTS_CACHE.clear()
 
 def get_date_range_interactively():
     """
@@ -599,6 +793,8 @@ def get_specific_month_input():
 
 # Example usage
 if __name__ == '__main__':
+    logging.basicConfig(level=LOG_LEVEL, format='%(message)s')
+    
     # Get calendar name from environment
     calendar_name = GOOGLE_CALENDAR_NAME
     
@@ -0,0 +1,16 @@
+"""
+Optional compiled build of the email rendering module.
+
+    pip install mypy
+    python setup.py build_ext --inplace
+
+This compiles email_sender.py with mypyc into a native extension that Python
+imports in place of the .py file. The scripts work the same without it.
+"""
+from setuptools import setup
+from mypyc.build import mypycify
+
+setup(
+    name='google-calendar-email-sender',
+    ext_modules=mypycify(['email_sender.py']),
+)